@@ -0,0 +1,120 @@
+import argparse
+import gc
+import multiprocessing as mp
+import resource
+import time
+import numpy as np
+import pandas as pd
+from utils import reindex_multi_series
+
+def generate_multi_series_data(n_series=10000, n_days=1096, gap_rate=0.2, seed=42):
+    """
+    Generate a long multi-series sales table with randomly dropped days.
+
+    Args:
+        n_series (int): Number of SKU/store series (default: 10000).
+        n_days (int): Length of the calendar in days (default: 1096, ~3 years).
+        gap_rate (float): Fraction of days dropped per series (default: 0.2).
+        seed (int): Random seed (default: 42).
+
+    Returns:
+        pd.DataFrame: Long DataFrame with 'sku_id', 'store_id', 'date', 'sales', 'stock'
+            using pandas' default dtypes (object ids, int64 values).
+    """
+    rng = np.random.default_rng(seed)
+    keep = rng.random((n_series, n_days)) >= gap_rate
+    # Always keep each series' first day so every series starts on the shared calendar
+    keep[:, 0] = True
+    series_idx, day_idx = np.nonzero(keep)
+    sales = rng.poisson(lam=30, size=len(series_idx)).astype(np.int64)
+    dates = pd.date_range(start='2023-01-01', periods=n_days, freq='D')
+    return pd.DataFrame({
+        'sku_id': np.char.add('SKU', (series_idx // 10).astype(str)).astype(object),
+        'store_id': np.char.add('STORE', (series_idx % 10).astype(str)).astype(object),
+        'date': dates[day_idx],
+        'sales': sales,
+        'stock': sales * 2,
+    })
+
+def asfreq_loop(df):
+    # Baseline: the single-series asfreq('D', method='ffill') applied to each series in turn
+    frames = []
+    for (sku_id, store_id), group in df.groupby(['sku_id', 'store_id'], sort=True):
+        filled = group.set_index('date')[['sales', 'stock']].asfreq('D', method='ffill')
+        filled['sku_id'] = sku_id
+        filled['store_id'] = store_id
+        frames.append(filled.reset_index())
+    return pd.concat(frames, ignore_index=True)
+
+def vectorized(df):
+    df = df.astype({'sku_id': 'category', 'store_id': 'category', 'sales': 'float32', 'stock': 'float32'})
+    return reindex_multi_series(df, sales_fill='ffill')
+
+def _peak_rss_mb():
+    # VmHWM can be reset between phases; fall back to ru_maxrss (kilobytes on Linux)
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def _reset_peak_rss():
+    # Writing 5 to clear_refs resets VmHWM to the current RSS (Linux only)
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+def _run(method, n_series, n_days, queue):
+    df = generate_multi_series_data(n_series=n_series, n_days=n_days)
+    gc.collect()
+    _reset_peak_rss()
+    base_rss = _peak_rss_mb()
+    start = time.perf_counter()
+    result = {'asfreq_loop': asfreq_loop, 'vectorized': vectorized}[method](df)
+    elapsed = time.perf_counter() - start
+    peak_rss = _peak_rss_mb()
+    queue.put({
+        'method': method,
+        'rows_out': len(result),
+        'wall_time_s': elapsed,
+        'peak_rss_mb': peak_rss,
+        'rss_growth_mb': peak_rss - base_rss,
+        'result_mb': result.memory_usage(deep=True).sum() / 1024 ** 2,
+    })
+
+def run_benchmark(n_series=10000, n_days=1096):
+    """
+    Compare the per-series asfreq loop with the vectorized multi-series reindex.
+
+    Each method runs in a fresh process, and the peak RSS high-water mark is reset after
+    the input is generated so it reflects the reindex itself where the OS allows it.
+
+    Args:
+        n_series (int): Number of series (default: 10000).
+        n_days (int): Calendar length in days (default: 1096).
+
+    Returns:
+        pd.DataFrame: One row per method with wall time and memory figures.
+    """
+    ctx = mp.get_context('spawn')
+    results = []
+    for method in ('asfreq_loop', 'vectorized'):
+        queue = ctx.Queue()
+        proc = ctx.Process(target=_run, args=(method, n_series, n_days, queue))
+        proc.start()
+        results.append(queue.get())
+        proc.join()
+    return pd.DataFrame(results).set_index('method')
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark multi-series daily reindexing")
+    parser.add_argument('--series', type=int, default=10000)
+    parser.add_argument('--days', type=int, default=1096)
+    args = parser.parse_args()
+    print(f"Reindexing {args.series} series x {args.days} days")
+    print(run_benchmark(n_series=args.series, n_days=args.days).round(2))
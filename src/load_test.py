@@ -0,0 +1,143 @@
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from urllib.parse import quote
+from benchmark_reindex import generate_multi_series_data
+
+SERVE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'serve.py')
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+async def _get(reader, writer, path):
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+async def run_client(port, series_keys, n_requests=5000, concurrency=64, zipf_a=1.2, seed=0):
+    """
+    Fire GET /forecast/{series} requests over keep-alive connections and time each one.
+
+    Series are drawn with a Zipf-like skew so popular series are often requested concurrently.
+
+    Args:
+        port (int): Server port on 127.0.0.1.
+        series_keys (list): Series to request.
+        n_requests (int): Total number of requests (default: 5000).
+        concurrency (int): Number of concurrent connections (default: 64).
+        zipf_a (float): Skew of the series popularity distribution (default: 1.2).
+        seed (int): Random seed (default: 0).
+
+    Returns:
+        dict: Request count, errors, p50/p99 latency in ms and requests/sec.
+    """
+    rng = np.random.default_rng(seed)
+    weights = 1.0 / np.arange(1, len(series_keys) + 1) ** zipf_a
+    picks = rng.choice(len(series_keys), size=n_requests, p=weights / weights.sum())
+    paths = [f"/forecast/{quote(series_keys[i])}" for i in picks]
+    latencies = []
+    errors = 0
+
+    async def worker(worker_paths):
+        nonlocal errors
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        try:
+            for path in worker_paths:
+                start = time.perf_counter()
+                status = await _get(reader, writer, path)
+                latencies.append(time.perf_counter() - start)
+                errors += status != 200
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(paths[i::concurrency]) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'p50_ms': np.percentile(latencies_ms, 50),
+        'p99_ms': np.percentile(latencies_ms, 99),
+        'requests_per_s': len(latencies) / elapsed,
+    }
+
+async def _wait_for_port(proc, port, mode, timeout=120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.returncode is not None:
+            raise RuntimeError(f"{mode} server exited with code {proc.returncode}")
+        try:
+            _, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"{mode} server did not start within {timeout}s")
+
+async def _benchmark_server(mode, data_path, series_keys, n_requests, concurrency):
+    port = _free_port()
+    args = [sys.executable, SERVE_PATH, '--data', data_path, '--port', str(port)]
+    if mode == 'naive':
+        args.append('--naive')
+    proc = await asyncio.create_subprocess_exec(*args, stdout=asyncio.subprocess.DEVNULL)
+    try:
+        await _wait_for_port(proc, port, mode)
+        # Warm up the process pool / model load before timing
+        await run_client(port, series_keys, n_requests=concurrency, concurrency=concurrency)
+        return {'mode': mode, **await run_client(port, series_keys, n_requests, concurrency)}
+    finally:
+        proc.terminate()
+        await proc.wait()
+
+def run_load_test(n_series=1000, n_days=1096, n_requests=5000, concurrency=64):
+    """
+    Load-test the batched forecast service against the naive per-request service.
+
+    Args:
+        n_series (int): Number of synthetic series served (default: 1000).
+        n_days (int): History length in days (default: 1096).
+        n_requests (int): Timed requests per server (default: 5000).
+        concurrency (int): Concurrent client connections (default: 64).
+
+    Returns:
+        pd.DataFrame: One row per server mode with latency percentiles and throughput.
+    """
+    df = generate_multi_series_data(n_series=n_series, n_days=n_days)
+    series_keys = (df['sku_id'] + ':' + df['store_id']).unique().tolist()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_path = os.path.join(tmp_dir, 'multi_series_sales.csv')
+        df.to_csv(data_path, index=False)
+        results = [
+            asyncio.run(_benchmark_server(mode, data_path, series_keys, n_requests, concurrency))
+            for mode in ('naive', 'batched')
+        ]
+    return pd.DataFrame(results).set_index('mode')
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the local forecast service")
+    parser.add_argument('--series', type=int, default=1000)
+    parser.add_argument('--days', type=int, default=1096)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    args = parser.parse_args()
+    print(f"{args.requests} requests, {args.concurrency} connections, {args.series} series x {args.days} days")
+    print(run_load_test(args.series, args.days, args.requests, args.concurrency).round(2))
@@ -2,8 +2,96 @@
 import os
 import pandas as pd
 import joblib
+import numpy as np
 import statsmodels.api as sm
 
+def load_model():
+    """
+    Load the trained ARIMA model from the Lambda task root or the local model directory.
+    Returns:
+        ARIMAResultsWrapper: Fitted statsmodels ARIMA results.
+    """
+    model_path = '/var/task/sales_forecast.pkl' if os.path.exists('/var/task/sales_forecast.pkl') else os.path.join(os.path.dirname(__file__), '..', 'model', 'sales_forecast.pkl')
+    try:
+        return joblib.load(model_path)
+    except Exception as e:
+        raise Exception(f"Failed to load model: {e}")
+
+def get_arima_params(model):
+    """
+    Extract the ARIMA order and coefficients needed by `forecast_sales_batch`.
+    Args:
+        model (ARIMAResultsWrapper): Fitted statsmodels ARIMA results.
+    Returns:
+        dict: 'd', 'const', 'ar' and 'ma' (coefficient arrays indexed by lag - 1).
+    """
+    p, d, q = model.model.order
+    if any(model.model.seasonal_order[:3]):
+        raise ValueError("Seasonal ARIMA models are not supported for batch forecasting")
+    if getattr(model.model, 'k_exog', 0):
+        raise ValueError("ARIMA models with exogenous regressors are not supported for batch forecasting")
+    params = dict(zip(model.param_names, np.asarray(model.params)))
+    # Anything else (e.g. trend terms 'x1' or 'drift') would be silently ignored by the batch forecast
+    unsupported = [name for name in params
+                   if name not in ('const', 'sigma2') and not name.startswith(('ar.L', 'ma.L'))]
+    if unsupported:
+        raise ValueError(f"Unsupported ARIMA parameters for batch forecasting: {unsupported}")
+    ar = np.zeros(p)
+    ma = np.zeros(q)
+    for name, value in params.items():
+        if name.startswith('ar.L'):
+            ar[int(name[4:]) - 1] = value
+        elif name.startswith('ma.L'):
+            ma[int(name[4:]) - 1] = value
+    return {'d': d, 'const': float(params.get('const', 0.0)), 'ar': ar, 'ma': ma}
+
+def forecast_sales_batch(histories, params, steps=7):
+    """
+    Forecast many series at once with one set of ARIMA coefficients.
+    The model's state is re-fitted to each series' own history, so for invertible models each
+    row equals `model.apply(history).forecast(steps)` once the history is a few weeks or longer.
+    Unlike `forecast_sales`, this does not reuse the forecast stored from the training data.
+    Residuals are rebuilt by conditional sum of squares, looping over time and vectorized
+    across series.
+    Args:
+        histories (np.ndarray): 2-D array of daily sales, one series per row, all ending on the same day.
+            NaNs (e.g. days before a series starts) are treated as the model mean.
+        params (dict): Output of `get_arima_params`.
+        steps (int): Number of days to forecast (default: 7).
+    Returns:
+        np.ndarray: Array of shape (n_series, steps) with forecasted sales.
+    """
+    y = np.asarray(histories, dtype=np.float64)
+    d, const, ar, ma = params['d'], params['const'], params['ar'], params['ma']
+    p, q = len(ar), len(ma)
+
+    # Difference d times, remembering the last level of each stage for integration
+    levels = []
+    w = y
+    for _ in range(d):
+        levels.append(np.nan_to_num(w[:, -1]))
+        w = np.diff(w, axis=1)
+    z = np.nan_to_num(w - const)
+
+    n_series, n_obs = z.shape
+    resid = np.zeros((n_series, n_obs + steps))
+    z = np.concatenate([z, np.zeros((n_series, steps))], axis=1)
+    for t in range(n_obs + steps):
+        pred = np.zeros(n_series)
+        for i in range(min(p, t)):
+            pred += ar[i] * z[:, t - i - 1]
+        for j in range(min(q, t)):
+            pred += ma[j] * resid[:, t - j - 1]
+        if t < n_obs:
+            resid[:, t] = z[:, t] - pred
+        else:
+            z[:, t] = pred
+
+    forecast = z[:, n_obs:] + const
+    for level in reversed(levels):
+        forecast = level[:, None] + np.cumsum(forecast, axis=1)
+    return forecast
+
 def forecast_sales(df):
     """
     Generate a 7-day sales forecast using the trained ARIMA model.
@@ -12,11 +100,7 @@ def forecast_sales(df):
     Returns:
         pd.DataFrame: DataFrame with forecasted dates and sales.
     """
-    model_path = '/var/task/sales_forecast.pkl' if os.path.exists('/var/task/sales_forecast.pkl') else os.path.join(os.path.dirname(__file__), '..', 'model', 'sales_forecast.pkl')
-    try:
-        model = joblib.load(model_path)
-    except Exception as e:
-        raise Exception(f"Failed to load model: {e}")
+    model = load_model()
 
     # Forecast next 7 days
     forecast = model.forecast(steps=7)
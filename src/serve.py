@@ -0,0 +1,276 @@
+import argparse
+import asyncio
+import json
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import unquote, urlsplit
+import numpy as np
+import pandas as pd
+from utils import load_and_preprocess_data, load_multi_series_data
+from predict import forecast_sales, forecast_sales_batch, get_arima_params, load_model
+
+def load_series_block(data_path=None, id_cols=('sku_id', 'store_id')):
+    """
+    Load sales histories as a dense (series x day) block on a shared daily calendar.
+
+    Args:
+        data_path (str): Multi-series CSV (see `utils.load_multi_series_data`). When None, the
+            single-series cleaned data is served as one series named 'total' (default: None).
+        id_cols (tuple): Columns identifying a series in `data_path` (default: ('sku_id', 'store_id')).
+
+    Returns:
+        tuple: (series keys, float32 sales block, pd.DatetimeIndex calendar). Multi-series keys
+            join the id values with ':', e.g. 'SKU1:STORE2'. Days before a series' first
+            sale are NaN so `forecast_sales_batch` does not treat them as zero sales.
+    """
+    if data_path is None:
+        df = load_and_preprocess_data()
+        return ['total'], df['sales'].to_numpy(np.float32)[None, :], df.index
+
+    df = load_multi_series_data(data_path, id_cols=id_cols, sales_fill=None)
+    calendar = pd.DatetimeIndex(df['date'].unique())
+    n_days = len(calendar)
+    # Reindexed output is sorted by series then date, one row per calendar day
+    first_days = df.iloc[::n_days]
+    keys = first_days[list(id_cols)].astype(str).agg(':'.join, axis=1).tolist()
+    block = df['sales'].to_numpy(np.float32).reshape(-1, n_days)
+    # Gaps after a series' first sale are days without sales; days before it stay NaN
+    missing = np.isnan(block)
+    block[missing & np.logical_or.accumulate(~missing, axis=1)] = 0
+    return keys, block, calendar
+
+class UnknownSeriesError(LookupError):
+    """Raised when a requested series is not in the served data."""
+
+def _forecast_records(dates, values):
+    return [{'date': date, 'sales': float(value)} for date, value in zip(dates, values)]
+
+class ForecastService:
+    """
+    Forecast service that coalesces identical concurrent requests and micro-batches distinct ones.
+
+    Requests arriving within `batch_window_ms` of each other (up to `max_batch_size` series) are
+    forecast together by one `predict.forecast_sales_batch` call in a process pool. Each series
+    is forecast from its own history, so results differ from `predict.forecast_sales`.
+    """
+
+    def __init__(self, data_path=None, steps=7, batch_window_ms=5, max_batch_size=256, workers=None):
+        self.keys, self.block, self.calendar = load_series_block(data_path)
+        self.index = {key: i for i, key in enumerate(self.keys)}
+        self.params = get_arima_params(load_model())
+        self.steps = steps
+        self.dates = pd.date_range(start=self.calendar[-1] + pd.Timedelta(days=1), periods=steps, freq='D').strftime('%Y-%m-%d')
+        self.batch_window = batch_window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+        self._inflight = {}
+        self._pending = []
+        self._flush_handle = None
+        self._tasks = set()
+
+    async def forecast(self, series):
+        if series not in self.index:
+            raise UnknownSeriesError(series)
+        # Coalesce: concurrent requests for the same series share one future
+        future = self._inflight.get(series)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._inflight[series] = future
+            self._pending.append(series)
+            if len(self._pending) >= self.max_batch_size:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        return await asyncio.shield(future)
+
+    async def forecast_many(self, series_list):
+        unknown = [series for series in series_list if series not in self.index]
+        if unknown:
+            raise UnknownSeriesError(', '.join(unknown))
+        results = await asyncio.gather(*(self.forecast(series) for series in series_list))
+        return dict(zip(series_list, results))
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch):
+        # Futures stay in _inflight while the batch computes, so later requests join them
+        futures = [self._inflight[series] for series in batch]
+        rows = self.block[[self.index[series] for series in batch]]
+        try:
+            loop = asyncio.get_running_loop()
+            values = await loop.run_in_executor(self.pool, forecast_sales_batch, rows, self.params, self.steps)
+        except asyncio.CancelledError:
+            # e.g. on shutdown; waiting requests must not hang on futures nobody will resolve
+            for future in futures:
+                future.cancel()
+            raise
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+            return
+        finally:
+            for series, future in zip(batch, futures):
+                if self._inflight.get(series) is future:
+                    del self._inflight[series]
+        for future, row in zip(futures, values):
+            future.set_result(_forecast_records(self.dates, row))
+
+    def close(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        for series in self._pending:
+            self._inflight.pop(series).cancel()
+        self._pending = []
+        for task in self._tasks:
+            task.cancel()
+        self.pool.shutdown(cancel_futures=True)
+
+class NaiveForecastService:
+    """
+    Baseline service that calls `predict.forecast_sales` once per request, on the event loop.
+
+    `forecast_sales` returns the forecast from the end of the training data for every series,
+    as the Lambda does, so only the dates depend on the requested series.
+    """
+
+    def __init__(self, data_path=None):
+        self.keys, self.block, self.calendar = load_series_block(data_path)
+        self.index = {key: i for i, key in enumerate(self.keys)}
+
+    async def forecast(self, series):
+        if series not in self.index:
+            raise UnknownSeriesError(series)
+        df = pd.DataFrame({'sales': self.block[self.index[series]]}, index=self.calendar)
+        forecast_df = forecast_sales(df)
+        return _forecast_records(forecast_df['date'], forecast_df['sales'])
+
+    async def forecast_many(self, series_list):
+        unknown = [series for series in series_list if series not in self.index]
+        if unknown:
+            raise UnknownSeriesError(', '.join(unknown))
+        return {series: await self.forecast(series) for series in series_list}
+
+    def close(self):
+        pass
+
+async def handle_request(service, method, target, body):
+    """
+    Route one HTTP request.
+
+    GET /forecast/{series} returns a forecast list, POST /forecast with {"series": [...]} returns
+    {"forecasts": {series: [...]}} and GET /series lists the available series.
+
+    Returns:
+        tuple: (HTTP status code, JSON-serializable payload).
+    """
+    path = unquote(urlsplit(target).path).rstrip('/')
+    try:
+        if method == 'GET' and path == '/series':
+            return 200, {'series': service.keys}
+        if method == 'GET' and path.startswith('/forecast/'):
+            series = path[len('/forecast/'):]
+            return 200, {'series': series, 'forecast': await service.forecast(series)}
+        if method == 'POST' and path == '/forecast':
+            try:
+                series_list = json.loads(body or b'{}')['series']
+            except (ValueError, KeyError, TypeError):
+                return 400, {'error': 'Request body must be JSON with a "series" list'}
+            if not isinstance(series_list, list):
+                return 400, {'error': 'Request body must be JSON with a "series" list'}
+            return 200, {'forecasts': await service.forecast_many([str(series) for series in series_list])}
+        return 404, {'error': f'No route for {method} {path}'}
+    except UnknownSeriesError as e:
+        return 404, {'error': f'Unknown series: {e}'}
+    except Exception as e:
+        return 500, {'error': str(e)}
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 500: 'Internal Server Error'}
+
+async def _write_response(writer, status, payload, keep_alive):
+    data = json.dumps(payload).encode()
+    writer.write(
+        f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(data)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data
+    )
+    await writer.drain()
+
+async def _handle_connection(service, reader, writer):
+    # Minimal HTTP/1.1 with keep-alive; enough for local serving and load testing
+    try:
+        while True:
+            # readline raises ValueError when a line exceeds the stream limit (64 KiB)
+            try:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                method, target, _ = request_line.decode('latin-1').split(' ', 2)
+                length = int(headers.get('content-length', 0))
+                if length < 0:
+                    raise ValueError(length)
+            except (ValueError, asyncio.LimitOverrunError):
+                await _write_response(writer, 400, {'error': 'Malformed HTTP request'}, keep_alive=False)
+                break
+            body = await reader.readexactly(length) if length else b''
+
+            status, payload = await handle_request(service, method, target, body)
+            keep_alive = headers.get('connection', '').lower() != 'close'
+            await _write_response(writer, status, payload, keep_alive)
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+async def serve(service, host='127.0.0.1', port=8080):
+    server = await asyncio.start_server(lambda r, w: _handle_connection(service, r, w), host, port)
+    print(f"Serving {len(service.keys)} series on http://{host}:{port}", flush=True)
+    # Stop cleanly on SIGTERM so process pool workers are shut down with the server
+    stop = asyncio.get_running_loop().create_future()
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set_result, None)
+    try:
+        async with server:
+            await stop
+    finally:
+        service.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local asyncio forecast service")
+    parser.add_argument('--data', default=None, help="Multi-series CSV; defaults to the single-series cleaned data")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', 8080)))
+    parser.add_argument('--batch-window-ms', type=float, default=5)
+    parser.add_argument('--max-batch-size', type=int, default=256)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--naive', action='store_true', help="Call predict.forecast_sales per request instead")
+    args = parser.parse_args()
+
+    if args.naive:
+        service = NaiveForecastService(args.data)
+    else:
+        service = ForecastService(args.data, batch_window_ms=args.batch_window_ms,
+                                  max_batch_size=args.max_batch_size, workers=args.workers)
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
@@ -1,5 +1,7 @@
 import pandas as pd
+import numpy as np
 import os
+from pandas.api.types import union_categoricals
 
 def load_and_preprocess_data(file_path='data/processed/cleaned_sales_data.csv'):
     """
@@ -40,6 +42,266 @@ def load_and_preprocess_data(file_path='data/processed/cleaned_sales_data.csv'):
 
     return df
 
+def forward_fill_rows(values, observed=None):
+    """
+    Forward-fill NaNs along each row of a 2-D array without a Python loop.
+
+    Args:
+        values (np.ndarray): 2-D float array, one series per row.
+        observed (np.ndarray): Optional boolean array marking the cells to keep and carry
+            forward; every other cell takes the last observed value to its left. Defaults to
+            the non-NaN cells.
+
+    Returns:
+        np.ndarray: Array with each unobserved cell replaced by the last observed value to its
+            left. Cells before a row's first observation are left as NaN.
+    """
+    n_rows, n_cols = values.shape
+    if observed is None:
+        observed = ~np.isnan(values)
+    # Flat intp indices up front, since fancy indexing would otherwise make its own intp copy
+    positions = np.where(observed, np.arange(n_cols, dtype=np.intp), 0)
+    np.maximum.accumulate(positions, axis=1, out=positions)
+    positions += np.arange(0, n_rows * n_cols, n_cols, dtype=np.intp)[:, None]
+    return values.ravel().take(positions)
+
+# Working memory per (series, day) cell while one chunk is filled: the sales and stock blocks
+# (2 x float32), the mask of cells present in the input, and forward_fill_rows' intp positions
+# and float32 result
+_FILL_BYTES_PER_CELL = 21
+# Rough memory per row while parsing one CSV chunk, dominated by the object 'date' strings
+_CSV_BYTES_PER_ROW = 128
+
+def _plan_reindex(df, id_cols, sales_fill, max_chunk_mb):
+    # Validate the input and compute everything the chunks share; None for an empty frame
+    missing = [col for col in id_cols + ['date', 'sales', 'stock'] if col not in df.columns]
+    if missing:
+        raise ValueError(f"DataFrame must contain columns: {missing}")
+    if max_chunk_mb <= 0:
+        raise ValueError("max_chunk_mb must be positive")
+    if isinstance(sales_fill, str) and sales_fill != 'ffill':
+        raise ValueError(f"Unsupported sales_fill: {sales_fill}")
+    if isinstance(df['date'].dtype, pd.DatetimeTZDtype):
+        raise ValueError("Timezone-aware dates are not supported; convert 'date' to naive local dates first")
+    if not pd.api.types.is_datetime64_dtype(df['date']):
+        raise ValueError("'date' column must contain datetimes")
+    if df.empty:
+        return None
+    if df['date'].isna().any():
+        raise ValueError("Some dates are missing in 'date' column")
+
+    # Compact categorical ids: combine per-column codes into one dense series code
+    ids = {col: df[col] if isinstance(df[col].dtype, pd.CategoricalDtype) else df[col].astype('category')
+           for col in id_cols}
+    # A missing id has code -1, which would let two different series share a combined key
+    for col in id_cols:
+        if (ids[col].cat.codes.to_numpy() < 0).any():
+            raise ValueError(f"Some series ids are missing in '{col}' column")
+    key = np.zeros(len(df), dtype=np.int64)
+    for col in id_cols:
+        key = key * len(ids[col].cat.categories) + ids[col].cat.codes.to_numpy(np.int64)
+    series_codes, series_keys = pd.factorize(key, sort=True)
+    del key
+    n_series = len(series_keys)
+
+    # Per-series id codes, taken from any row of the series
+    first_row = np.empty(n_series, dtype=np.int64)
+    first_row[series_codes] = np.arange(len(df))
+    series_id_codes = {col: ids[col].cat.codes.to_numpy()[first_row] for col in id_cols}
+
+    # Shared daily calendar and int32 day offsets
+    dates = df['date'].to_numpy('datetime64[D]')
+    start = dates.min()
+    calendar = pd.date_range(start=start, end=dates.max(), freq='D')
+    n_days = len(calendar)
+    day_offsets = (dates - start).astype(np.int32)
+
+    cell = series_codes.astype(np.int64) * n_days + day_offsets
+    del dates, day_offsets, series_codes
+
+    # Sorting by cell groups rows by series and puts duplicate (series, date) pairs side by side
+    order = np.argsort(cell, kind='stable')
+    cell = cell[order]
+    if (np.diff(cell) == 0).any():
+        raise ValueError("Duplicate dates found within a series")
+
+    return {
+        'categories': {col: ids[col].cat.categories for col in id_cols},
+        'series_id_codes': series_id_codes,
+        'calendar': calendar,
+        'n_series': n_series,
+        'n_days': n_days,
+        'cell': cell,
+        'sales': df['sales'].to_numpy(np.float32)[order],
+        'stock': df['stock'].to_numpy(np.float32)[order],
+    }
+
+def _iter_filled_blocks(plan, sales_fill, max_chunk_mb, bytes_per_cell):
+    # Yield (first series, sales block, stock block) for chunks of series sized to max_chunk_mb
+    n_series, n_days, cell = plan['n_series'], plan['n_days'], plan['cell']
+    series_per_chunk = max(1, int(max_chunk_mb * 1024 * 1024 // (n_days * bytes_per_cell)))
+
+    chunk_starts = np.arange(0, n_series, series_per_chunk)
+    bounds = np.searchsorted(cell, np.append(chunk_starts, n_series) * n_days)
+    for chunk_start, lo, hi in zip(chunk_starts, bounds[:-1], bounds[1:]):
+        chunk_size = min(series_per_chunk, n_series - chunk_start)
+        local_cell = cell[lo:hi] - chunk_start * n_days
+
+        sales_block = np.full(chunk_size * n_days, np.nan, dtype=np.float32)
+        stock_block = np.full(chunk_size * n_days, np.nan, dtype=np.float32)
+        observed = np.zeros(chunk_size * n_days, dtype=bool)
+        sales_block[local_cell] = plan['sales'][lo:hi]
+        stock_block[local_cell] = plan['stock'][lo:hi]
+        observed[local_cell] = True
+        del local_cell
+        # Like asfreq, only the days the reindex inserts are filled; NaNs in the input are kept
+        observed = observed.reshape(chunk_size, n_days)
+        sales_block = sales_block.reshape(chunk_size, n_days)
+        stock_block = forward_fill_rows(stock_block.reshape(chunk_size, n_days), observed)
+
+        if sales_fill == 'ffill':
+            sales_block = forward_fill_rows(sales_block, observed)
+        elif sales_fill is not None:
+            sales_block[~observed] = sales_fill
+
+        yield chunk_start, sales_block, stock_block
+
+def _frame_from_columns(plan, id_codes, dates, sales, stock):
+    # copy=False keeps each column's buffer as is instead of consolidating sales and stock
+    columns = {col: pd.Categorical.from_codes(codes, categories=plan['categories'][col])
+               for col, codes in id_codes.items()}
+    columns.update({'date': dates, 'sales': sales, 'stock': stock})
+    return pd.DataFrame(columns, copy=False)
+
+def iter_reindexed_series(df, id_cols=('sku_id', 'store_id'), sales_fill=0, max_chunk_mb=256):
+    """
+    Reindex every series onto a shared daily calendar, yielding one chunk of series at a time.
+
+    Series are laid out as rows of a dense (series x day) float32 block, so gap filling is a
+    handful of array operations per chunk instead of one `asfreq` call per series. The number
+    of series per chunk is chosen so filling a chunk and building its DataFrame stay under
+    about `max_chunk_mb`. Sorting the input rows beforehand takes about 24 bytes per row on top
+    of `df` itself, independent of the cap.
+
+    Args:
+        df (pd.DataFrame): Long DataFrame with 'date', 'sales', 'stock' and the id columns.
+            Missing ids and duplicate dates within a series raise a ValueError.
+        id_cols (tuple): Columns identifying a series (default: ('sku_id', 'store_id')).
+        sales_fill (float or str): Value for missing sales days, 'ffill' to carry the last
+            value forward, or None to leave NaN (default: 0).
+        max_chunk_mb (float): Approximate memory cap per chunk in megabytes (default: 256).
+
+    Yields:
+        pd.DataFrame: Long DataFrame with the id columns (categorical), 'date', 'sales'
+            and 'stock' (float32), covering every day from the earliest to the latest date.
+            Stock is forward-filled; days before a series' first observation stay NaN. As with
+            `asfreq`, only the days missing from `df` are filled: NaNs in `df` are kept.
+    """
+    id_cols = list(id_cols)
+    plan = _plan_reindex(df, id_cols, sales_fill, max_chunk_mb)
+    if plan is None:
+        return
+    n_days, calendar = plan['n_days'], plan['calendar'].values
+    # Each yielded chunk also holds a datetime64 date and the id codes for every cell
+    bytes_per_cell = _FILL_BYTES_PER_CELL + 8 + sum(codes.itemsize for codes in plan['series_id_codes'].values())
+
+    for chunk_start, sales_block, stock_block in _iter_filled_blocks(plan, sales_fill, max_chunk_mb, bytes_per_cell):
+        chunk_size = len(sales_block)
+        id_codes = {col: np.repeat(codes[chunk_start:chunk_start + chunk_size], n_days)
+                    for col, codes in plan['series_id_codes'].items()}
+        yield _frame_from_columns(plan, id_codes, np.tile(calendar, chunk_size),
+                                  sales_block.ravel(), stock_block.ravel())
+
+def reindex_multi_series(df, id_cols=('sku_id', 'store_id'), sales_fill=0, max_chunk_mb=256):
+    """
+    Reindex every series onto a shared daily calendar in one vectorized pass.
+
+    Multi-series counterpart of `load_and_preprocess_data`'s `asfreq('D', method='ffill')`;
+    see `iter_reindexed_series` for the fill rules. Chunks are written straight into the
+    preallocated result, so peak memory is about the result plus `max_chunk_mb`.
+
+    Args:
+        df (pd.DataFrame): Long DataFrame with 'date', 'sales', 'stock' and the id columns.
+        id_cols (tuple): Columns identifying a series (default: ('sku_id', 'store_id')).
+        sales_fill (float or str): Value for missing sales days, 'ffill', or None (default: 0).
+        max_chunk_mb (float): Approximate memory cap per chunk in megabytes (default: 256).
+
+    Returns:
+        pd.DataFrame: Long DataFrame sorted by series then date.
+    """
+    id_cols = list(id_cols)
+    plan = _plan_reindex(df, id_cols, sales_fill, max_chunk_mb)
+    if plan is None:
+        # Same schema as a non-empty result
+        columns = {col: pd.Categorical([], categories=df[col].cat.categories
+                                       if isinstance(df[col].dtype, pd.CategoricalDtype) else None)
+                   for col in id_cols}
+        columns.update({'date': np.array([], dtype='datetime64[ns]'),
+                        'sales': np.array([], dtype=np.float32), 'stock': np.array([], dtype=np.float32)})
+        return pd.DataFrame(columns)
+    n_series, n_days = plan['n_series'], plan['n_days']
+
+    # Ids and dates repeat per series, so they are broadcast into place without temporaries
+    id_codes = {}
+    for col, codes in plan['series_id_codes'].items():
+        id_codes[col] = np.empty(n_series * n_days, dtype=codes.dtype)
+        id_codes[col].reshape(n_series, n_days)[:] = codes[:, None]
+    dates = np.empty(n_series * n_days, dtype='datetime64[ns]')
+    dates.reshape(n_series, n_days)[:] = plan['calendar'].values
+    sales = np.empty((n_series, n_days), dtype=np.float32)
+    stock = np.empty((n_series, n_days), dtype=np.float32)
+
+    for chunk_start, sales_block, stock_block in _iter_filled_blocks(plan, sales_fill, max_chunk_mb, _FILL_BYTES_PER_CELL):
+        sales[chunk_start:chunk_start + len(sales_block)] = sales_block
+        stock[chunk_start:chunk_start + len(stock_block)] = stock_block
+    return _frame_from_columns(plan, id_codes, dates, sales.ravel(), stock.ravel())
+
+def load_multi_series_data(file_path, id_cols=('sku_id', 'store_id'), sales_fill=0, max_chunk_mb=256):
+    """
+    Load a long multi-series sales table with compact dtypes and reindex it to daily frequency.
+
+    The CSV is parsed in chunks of rows sized to `max_chunk_mb`, so the raw date strings of
+    the whole file are never held at once.
+
+    Args:
+        file_path (str): Path to a CSV with 'date', 'sales', 'stock' and the id columns.
+        id_cols (tuple): Columns identifying a series (default: ('sku_id', 'store_id')).
+        sales_fill (float or str): Value for missing sales days, 'ffill', or None (default: 0).
+        max_chunk_mb (float): Approximate memory cap per chunk in megabytes (default: 256).
+
+    Returns:
+        pd.DataFrame: Long DataFrame with categorical ids, 'date' and float32 'sales'/'stock'.
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Data file not found at {file_path}")
+    if max_chunk_mb <= 0:
+        raise ValueError("max_chunk_mb must be positive")
+
+    id_cols = list(id_cols)
+    dtypes = {col: 'category' for col in id_cols}
+    dtypes.update({'sales': 'float32', 'stock': 'float32'})
+    chunk_rows = max(1, int(max_chunk_mb * 1024 * 1024 // _CSV_BYTES_PER_ROW))
+    parts = {col: [] for col in id_cols + ['date', 'sales', 'stock']}
+    try:
+        for chunk in pd.read_csv(file_path, usecols=[*id_cols, 'date', 'sales', 'stock'], dtype=dtypes, chunksize=chunk_rows):
+            chunk['date'] = pd.to_datetime(chunk['date'], errors='coerce')
+            for col in parts:
+                parts[col].append(chunk[col] if col in id_cols else chunk[col].to_numpy())
+    except Exception as e:
+        raise ValueError(f"Error reading {file_path}: {str(e)}")
+
+    # Combine one column at a time so only a single column is ever duplicated
+    columns = {}
+    for col in list(parts):
+        col_parts = parts.pop(col)
+        columns[col] = union_categoricals(col_parts, sort_categories=True) if col in id_cols else np.concatenate(col_parts)
+        del col_parts
+    if np.isnat(columns['date']).any():
+        raise ValueError("Some dates could not be parsed in 'date' column")
+    df = pd.DataFrame(columns, copy=False)
+
+    return reindex_multi_series(df, id_cols=id_cols, sales_fill=sales_fill, max_chunk_mb=max_chunk_mb)
+
 def calculate_reorder_threshold(df, multiplier=1.5):
     """
     Calculate the reorder threshold based on average daily sales.
@@ -0,0 +1,27 @@
+import os
+import numpy as np
+import pytest
+import statsmodels.api as sm
+from predict import forecast_sales_batch, get_arima_params, load_model
+from utils import load_and_preprocess_data
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'processed', 'cleaned_sales_data.csv')
+
+def test_forecast_sales_batch_matches_model_applied_to_history():
+    model = load_model()
+    history = load_and_preprocess_data(DATA_PATH)['sales'].to_numpy(np.float64)
+    expected = np.asarray(model.apply(history).forecast(7))
+    actual = forecast_sales_batch(history[None, :], get_arima_params(model), steps=7)[0]
+    np.testing.assert_allclose(actual, expected, rtol=1e-6)
+
+@pytest.mark.parametrize('order, trend, exog', [
+    ((1, 1, 1), 't', False),
+    ((1, 0, 0), 'ct', False),
+    ((1, 0, 0), 'c', True),
+])
+def test_get_arima_params_rejects_terms_the_batch_forecast_ignores(order, trend, exog):
+    history = load_and_preprocess_data(DATA_PATH)['sales'].to_numpy(np.float64)[-120:]
+    regressors = np.arange(len(history), dtype=np.float64) if exog else None
+    model = sm.tsa.ARIMA(history, order=order, trend=trend, exog=regressors).fit()
+    with pytest.raises(ValueError, match='not supported|Unsupported'):
+        get_arima_params(model)
@@ -0,0 +1,114 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import pytest
+import serve
+from serve import ForecastService, UnknownSeriesError, _handle_connection, handle_request, load_series_block
+
+def _write_sales_csv(tmp_path):
+    path = tmp_path / 'sales.csv'
+    pd.DataFrame({
+        'sku_id': ['A', 'A', 'B', 'B'],
+        'store_id': ['S1', 'S1', 'S1', 'S1'],
+        'date': ['2024-01-01', '2024-01-04', '2024-01-03', '2024-01-05'],
+        'sales': [5, 6, 7, 8],
+        'stock': [10, 10, 10, 10],
+    }).to_csv(path, index=False)
+    return str(path)
+
+def test_load_series_block_keeps_days_before_first_sale_missing(tmp_path):
+    keys, block, calendar = load_series_block(_write_sales_csv(tmp_path))
+    assert keys == ['A:S1', 'B:S1']
+    assert len(calendar) == 5
+    np.testing.assert_array_equal(block[0], [5, 0, 0, 6, 0])
+    np.testing.assert_array_equal(block[1], [np.nan, np.nan, 7, 0, 8])
+
+class _StubService:
+    keys = ['A:S1']
+
+    async def forecast(self, series):
+        if series not in self.keys:
+            raise UnknownSeriesError(series)
+        # A KeyError from inside the computation is a server error, not an unknown series
+        raise KeyError('sales')
+
+    async def forecast_many(self, series_list):
+        return {series: await self.forecast(series) for series in series_list}
+
+def test_handle_request_distinguishes_unknown_series_from_internal_errors():
+    status, payload = asyncio.run(handle_request(_StubService(), 'GET', '/forecast/B:S1', b''))
+    assert status == 404 and payload['error'] == 'Unknown series: B:S1'
+    status, _ = asyncio.run(handle_request(_StubService(), 'GET', '/forecast/A:S1', b''))
+    assert status == 500
+
+async def _send_raw(request):
+    server = await asyncio.start_server(lambda r, w: _handle_connection(_StubService(), r, w), '127.0.0.1', 0)
+    async with server:
+        reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+        writer.write(request)
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+    return response
+
+def test_malformed_requests_get_400():
+    assert asyncio.run(_send_raw(b'garbage\r\n\r\n')).startswith(b'HTTP/1.1 400')
+    bad_length = b'POST /forecast HTTP/1.1\r\nContent-Length: abc\r\n\r\n'
+    assert asyncio.run(_send_raw(bad_length)).startswith(b'HTTP/1.1 400')
+    long_line = b'GET /forecast/' + b'a' * 70000 + b' HTTP/1.1\r\n\r\n'
+    assert asyncio.run(_send_raw(long_line)).startswith(b'HTTP/1.1 400')
+    long_header = b'GET /series HTTP/1.1\r\nX-Pad: ' + b'a' * 70000 + b'\r\n\r\n'
+    assert asyncio.run(_send_raw(long_header)).startswith(b'HTTP/1.1 400')
+
+def _slow_service(tmp_path, monkeypatch, calls, delay=0.2):
+    service = ForecastService(_write_sales_csv(tmp_path), batch_window_ms=1)
+    # A thread pool lets the test patch the batch function the service calls
+    service.pool.shutdown()
+    service.pool = ThreadPoolExecutor(max_workers=1)
+
+    def slow_batch(rows, params, steps):
+        calls.append(len(rows))
+        time.sleep(delay)
+        return np.zeros((len(rows), steps))
+
+    monkeypatch.setattr(serve, 'forecast_sales_batch', slow_batch)
+    return service
+
+def test_request_arriving_mid_computation_joins_running_batch(tmp_path, monkeypatch):
+    calls = []
+    service = _slow_service(tmp_path, monkeypatch, calls)
+
+    async def run():
+        first = asyncio.ensure_future(service.forecast('A:S1'))
+        await asyncio.sleep(0.05)
+        assert calls == [1]  # the first batch is computing
+        second = await service.forecast('A:S1')
+        return await first, second
+
+    try:
+        first, second = asyncio.run(run())
+    finally:
+        service.close()
+    assert calls == [1]
+    assert first == second
+
+def test_cancelled_batch_cancels_waiting_requests(tmp_path, monkeypatch):
+    calls = []
+    service = _slow_service(tmp_path, monkeypatch, calls)
+
+    async def run():
+        request = asyncio.ensure_future(service.forecast('A:S1'))
+        await asyncio.sleep(0.05)
+        for task in list(service._tasks):
+            task.cancel()
+        # Fails with TimeoutError if the request is left waiting on an unresolved future
+        await asyncio.wait_for(request, timeout=1)
+
+    try:
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(run())
+    finally:
+        service.close()
+    assert service._inflight == {}
@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils import iter_reindexed_series, load_multi_series_data, reindex_multi_series
+
+def _sample_data(n_series=30, n_days=60, seed=0):
+    rng = np.random.default_rng(seed)
+    frames = []
+    for i in range(n_series):
+        dates = pd.date_range('2024-01-01', periods=n_days, freq='D')
+        keep = rng.random(n_days) > 0.3
+        # Stagger start and end dates so series cover different parts of the shared calendar
+        keep[: i % 7] = False
+        keep[n_days - i % 5:] = False
+        frames.append(pd.DataFrame({
+            'sku_id': f'SKU{i // 3}',
+            'store_id': f'STORE{i % 3}',
+            'date': dates[keep],
+            'sales': rng.integers(0, 50, keep.sum()),
+            'stock': rng.integers(0, 100, keep.sum()),
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+def _assert_matches_asfreq(df, result):
+    for (sku_id, store_id), group in df.groupby(['sku_id', 'store_id']):
+        expected = group.set_index('date')[['sales', 'stock']].asfreq('D', method='ffill')
+        actual = result[(result['sku_id'] == sku_id) & (result['store_id'] == store_id)].set_index('date')
+        np.testing.assert_allclose(actual.loc[expected.index, ['sales', 'stock']].to_numpy(), expected.to_numpy())
+
+@pytest.mark.parametrize('max_chunk_mb', [256, 0.001])
+def test_reindex_matches_per_series_asfreq(max_chunk_mb):
+    df = _sample_data()
+    result = reindex_multi_series(df, sales_fill='ffill', max_chunk_mb=max_chunk_mb)
+    assert len(result) == 30 * 60
+    _assert_matches_asfreq(df, result)
+
+def test_reindex_keeps_nans_from_input_like_asfreq():
+    df = _sample_data().astype({'sales': 'float64', 'stock': 'float64'})
+    rng = np.random.default_rng(1)
+    df.loc[rng.random(len(df)) < 0.1, 'stock'] = np.nan
+    df.loc[rng.random(len(df)) < 0.1, 'sales'] = np.nan
+    _assert_matches_asfreq(df, reindex_multi_series(df, sales_fill='ffill', max_chunk_mb=0.001))
+
+    # Only inserted days take sales_fill; a NaN sale in the input stays NaN
+    result = reindex_multi_series(df, sales_fill=0)
+    merged = df.merge(result, on=['sku_id', 'store_id', 'date'], suffixes=('', '_out'))
+    assert merged['sales_out'].isna().sum() == df['sales'].isna().sum()
+
+def test_iter_reindexed_series_chunks_match_full_result():
+    df = _sample_data()
+    chunks = list(iter_reindexed_series(df, max_chunk_mb=0.001))
+    assert len(chunks) > 1
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), reindex_multi_series(df))
+
+def test_load_multi_series_data_reads_csv_in_chunks(tmp_path):
+    df = _sample_data()
+    path = tmp_path / 'sales.csv'
+    df.sample(frac=1, random_state=0).to_csv(path, index=False)
+    # A tiny cap parses the CSV a few rows at a time, so categories must be unioned across chunks
+    result = load_multi_series_data(str(path), sales_fill='ffill', max_chunk_mb=0.001)
+    assert result['sku_id'].dtype == 'category' and result['sales'].dtype == np.float32
+    _assert_matches_asfreq(df, result)
+
+def test_reindex_empty_input_keeps_result_schema():
+    df = _sample_data(n_series=2).astype({'sku_id': 'category', 'store_id': 'category'}).iloc[:0]
+    result = reindex_multi_series(df)
+    expected = reindex_multi_series(_sample_data(n_series=2))
+    assert result.empty
+    pd.testing.assert_series_equal(result.dtypes, expected.dtypes)
+
+def test_reindex_rejects_missing_ids():
+    df = pd.DataFrame({
+        'sku_id': ['A', 'A', 'B'],
+        'store_id': ['S1', 'S2', np.nan],
+        'date': pd.to_datetime(['2024-01-01', '2024-01-01', '2024-01-02']),
+        'sales': [1, 2, 3],
+        'stock': [10, 20, 30],
+    })
+    with pytest.raises(ValueError, match='missing'):
+        reindex_multi_series(df)
+
+@pytest.mark.parametrize('dates, match', [
+    (pd.to_datetime(['2024-01-01', None]), 'missing'),
+    (pd.to_datetime(['2024-01-01', '2024-01-02']).tz_localize('UTC'), 'Timezone'),
+])
+def test_reindex_rejects_invalid_dates(dates, match):
+    df = pd.DataFrame({'sku_id': 'A', 'store_id': 'S1', 'date': dates, 'sales': [1, 2], 'stock': [3, 4]})
+    with pytest.raises(ValueError, match=match):
+        reindex_multi_series(df)
+
+def test_reindex_rejects_duplicate_dates():
+    df = _sample_data(n_series=2)
+    with pytest.raises(ValueError, match='Duplicate'):
+        reindex_multi_series(pd.concat([df, df.head(1)]))
+
+def test_reindex_sales_fill_leaves_infinite_values():
+    df = pd.DataFrame({
+        'sku_id': 'A',
+        'store_id': 'S1',
+        'date': pd.to_datetime(['2024-01-01', '2024-01-03']),
+        'sales': [np.inf, -np.inf],
+        'stock': [10, 20],
+    })
+    result = reindex_multi_series(df, sales_fill=0)
+    assert result['sales'].tolist() == [np.inf, 0, -np.inf]